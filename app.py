@@ -1,24 +1,33 @@
 import streamlit as st
 import sqlite3
 import hashlib
+import hmac
+import secrets
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import openai
 from datetime import datetime, timedelta
 import pandas as pd
+import numpy as np
 import time
 import logging
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional
 import re
-from dataclasses import dataclass
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import schedule
-import threading
+from selenium.common.exceptions import TimeoutException
+from apscheduler.schedulers.background import BackgroundScheduler
+import atexit
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import smtplib
 # Fixed import - try multiple approaches for email MIME classes
 try:
@@ -56,7 +65,7 @@ except ImportError:
             def as_string(self):
                 return str(self._parts)
 
-import os
+from pathlib import Path
 from bs4 import BeautifulSoup
 import uuid
 import plotly.express as px
@@ -81,7 +90,7 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-@dataclass
+@dataclass(slots=True)
 class JobProfile:
     id: str
     name: str
@@ -90,8 +99,15 @@ class JobProfile:
     summary: str
     target_positions: List[str]
     created_at: datetime
+    skills_text: str = field(init=False, repr=False, compare=False)
+    targets_text: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Joined once here instead of in every prompt and embedding
+        self.skills_text = ', '.join(self.skills)
+        self.targets_text = ', '.join(self.target_positions)
 
-@dataclass
+@dataclass(slots=True)
 class Job:
     id: str
     title: str
@@ -103,8 +119,14 @@ class Job:
     posted_date: datetime
     match_score: float
     source: str
+    description_preview: str = field(default="", repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Sliced once at ingest; copies rebuilt from a JobIndex pass the stored preview through
+        if not self.description_preview:
+            self.description_preview = self.description[:200] + ("..." if len(self.description) > 200 else "")
 
-@dataclass
+@dataclass(slots=True)
 class Application:
     id: str
     job_id: str
@@ -116,121 +138,394 @@ class Application:
     response_received: bool
     notes: str
 
+EMBEDDING_DIM = 512
+_TOKEN_RE = re.compile(r'[a-z0-9+#]+')
+
+def embed_text(text: str) -> np.ndarray:
+    """Embed text as a hashed bag-of-words vector (stable across processes)"""
+    tokens = _TOKEN_RE.findall(text.lower())
+    buckets = [zlib.crc32(token.encode()) % EMBEDDING_DIM for token in tokens]
+    return np.bincount(buckets, minlength=EMBEDDING_DIM).astype(np.float32)
+
+# Use a serial JIT kernel for batch scoring when numba is installed; results are at most a few
+# dozen rows, and parallel kernels misbehave when called from Streamlit's script threads
+try:
+    from numba import njit
+    
+    @njit(fastmath=True, cache=True)
+    def batch_cosine(matrix, query, norms, query_norm):
+        """Cosine similarity of each matrix row with the query vector"""
+        out = np.zeros(matrix.shape[0], dtype=np.float32)
+        for i in range(matrix.shape[0]):
+            denom = norms[i] * query_norm
+            if denom > 0:
+                dot = 0.0
+                for k in range(matrix.shape[1]):
+                    dot += matrix[i, k] * query[k]
+                out[i] = dot / denom
+        return out
+except ImportError:
+    def batch_cosine(matrix, query, norms, query_norm):
+        """Cosine similarity of each matrix row with the query vector"""
+        denom = norms * query_norm
+        return np.divide(
+            matrix @ query, denom,
+            out=np.zeros(matrix.shape[0], dtype=np.float32),
+            where=denom > 0
+        )
+
+def job_text(job: Job) -> str:
+    """Text used to embed a job for match scoring"""
+    return f"{job.title} {job.description}"
+
+def profile_text(profile: JobProfile) -> str:
+    """Text used to embed a profile for match scoring"""
+    return f"{profile.summary} {profile.skills_text} {profile.targets_text}"
+
+class JobIndex:
+    """Column-oriented search results with an embedding matrix for batch match scoring"""
+    
+    def __init__(self, jobs: List[Job]):
+        self.columns = {
+            f.name: np.array([getattr(job, f.name) for job in jobs], dtype=object)
+            for f in fields(Job) if f.name != 'match_score'
+        }
+        self.match_scores = np.array([job.match_score for job in jobs], dtype=np.float64)
+        self.embeddings = np.array([embed_text(job_text(job)) for job in jobs], dtype=np.float32).reshape(len(jobs), EMBEDDING_DIM)
+        self.doc_freq = np.count_nonzero(self.embeddings, axis=0)
+    
+    def __len__(self) -> int:
+        return len(self.match_scores)
+    
+    def __iter__(self):
+        return (self.row(i) for i in range(len(self)))
+    
+    def row(self, i: int) -> Job:
+        """Materialize one result as a Job"""
+        return Job(
+            match_score=float(self.match_scores[i]),
+            **{name: column[i] for name, column in self.columns.items()}
+        )
+    
+    def score(self, profile: JobProfile) -> np.ndarray:
+        """Score every job against a profile with TF-IDF weighting and one matrix-vector product"""
+        query = embed_text(profile_text(profile))
+        # Smoothed IDF over the profile plus this result set, so terms every posting shares count for less
+        df = self.doc_freq + (query > 0)
+        idf = (np.log((2 + len(self)) / (1 + df)) + 1).astype(np.float32)
+        weighted = self.embeddings * idf
+        query *= idf
+        scores = batch_cosine(weighted, query, np.linalg.norm(weighted, axis=1), np.float32(np.linalg.norm(query)))
+        self.match_scores = scores.astype(np.float64)
+        return self.match_scores
+    
+    def to_frame(self) -> pd.DataFrame:
+        """Build the results table straight from the columns"""
+        return pd.DataFrame({
+            'Title': self.columns['title'],
+            'Company': self.columns['company'],
+            'Location': self.columns['location'],
+            'Salary': self.columns['salary_range'],
+            'Posted': [posted.strftime('%Y-%m-%d') for posted in self.columns['posted_date']],
+            'Source': self.columns['source'],
+            'Match Score': self.match_scores.round(2)
+        })
+
+SQL_INSERT_JOB = "INSERT OR REPLACE INTO jobs (id, title, company, location, description, url, salary_range, posted_date, match_score, source) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
 class DatabaseManager:
     def __init__(self, db_name: str = "job_automation.db"):
         self.db_name = db_name
+        self._pool = queue.SimpleQueue()
         self.init_database()
     
+    def _open(self) -> sqlite3.Connection:
+        """Open and tune a new connection"""
+        conn = sqlite3.connect(self.db_name, check_same_thread=False, isolation_level=None, cached_statements=256)
+        conn.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-65536;
+            PRAGMA busy_timeout=5000;
+            PRAGMA mmap_size=268435456;
+        ''')
+        return conn
+    
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection, opening a new one only when every pooled one is in use"""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._open()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._pool.put(conn)
+    
     def init_database(self):
         """Initialize database tables"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        # Users table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id TEXT PRIMARY KEY,
-                username TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                email TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Profiles table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS profiles (
-                id TEXT PRIMARY KEY,
-                user_id TEXT,
-                name TEXT NOT NULL,
-                skills TEXT,
-                experience TEXT,
-                summary TEXT,
-                target_positions TEXT,
-                resume_path TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
-        
-        # Jobs table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS jobs (
-                id TEXT PRIMARY KEY,
-                title TEXT NOT NULL,
-                company TEXT,
-                location TEXT,
-                description TEXT,
-                url TEXT,
-                salary_range TEXT,
-                posted_date TIMESTAMP,
-                match_score REAL,
-                source TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Applications table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS applications (
-                id TEXT PRIMARY KEY,
-                job_id TEXT,
-                profile_id TEXT,
-                user_id TEXT,
-                status TEXT DEFAULT 'pending',
-                applied_date TIMESTAMP,
-                cover_letter TEXT,
-                custom_answers TEXT,
-                response_received BOOLEAN DEFAULT 0,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (job_id) REFERENCES jobs (id),
-                FOREIGN KEY (profile_id) REFERENCES profiles (id),
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
-        
-        # Settings table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS settings (
-                user_id TEXT PRIMARY KEY,
-                openai_api_key TEXT,
-                email_settings TEXT,
-                automation_settings TEXT,
-                notification_settings TEXT,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            # Users table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS users (
+                    id TEXT PRIMARY KEY,
+                    username TEXT UNIQUE NOT NULL,
+                    password_hash TEXT NOT NULL,
+                    email TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Profiles table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS profiles (
+                    id TEXT PRIMARY KEY,
+                    user_id TEXT,
+                    name TEXT NOT NULL,
+                    skills TEXT,
+                    experience TEXT,
+                    summary TEXT,
+                    target_positions TEXT,
+                    resume_path TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
+                )
+            ''')
+            
+            # Jobs table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    company TEXT,
+                    location TEXT,
+                    description TEXT,
+                    url TEXT,
+                    salary_range TEXT,
+                    posted_date TIMESTAMP,
+                    match_score REAL,
+                    source TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Applications table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS applications (
+                    id TEXT PRIMARY KEY,
+                    job_id TEXT,
+                    profile_id TEXT,
+                    user_id TEXT,
+                    status TEXT DEFAULT 'pending',
+                    applied_date TIMESTAMP,
+                    cover_letter TEXT,
+                    custom_answers TEXT,
+                    response_received BOOLEAN DEFAULT 0,
+                    notes TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (job_id) REFERENCES jobs (id),
+                    FOREIGN KEY (profile_id) REFERENCES profiles (id),
+                    FOREIGN KEY (user_id) REFERENCES users (id)
+                )
+            ''')
+            
+            # Settings table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS settings (
+                    user_id TEXT PRIMARY KEY,
+                    openai_api_key TEXT,
+                    email_settings TEXT,
+                    automation_settings TEXT,
+                    notification_settings TEXT,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
+                )
+            ''')
+            
+            # AI response cache, keyed by a hash of the request
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS ai_cache (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Scraper result cache, keyed by a hash of the search
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS scraper_cache (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    fetched_at TIMESTAMP NOT NULL
+                )
+            ''')
+            
+            # Indexes for per-user lookups (users.username is covered by its UNIQUE constraint)
+            cursor.executescript('''
+                CREATE INDEX IF NOT EXISTS ix_profiles_user_id ON profiles (user_id);
+                CREATE INDEX IF NOT EXISTS ix_applications_user_date ON applications (user_id, applied_date DESC);
+                CREATE INDEX IF NOT EXISTS ix_applications_user_status_date ON applications (user_id, status, applied_date);
+                CREATE INDEX IF NOT EXISTS ix_applications_job_id ON applications (job_id);
+                CREATE INDEX IF NOT EXISTS ix_applications_profile_id ON applications (profile_id);
+                CREATE INDEX IF NOT EXISTS ix_jobs_source_posted_date ON jobs (source, posted_date);
+            ''')
     
     def execute_query(self, query: str, params: tuple = (), fetch: bool = False):
         """Execute database query safely"""
         try:
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            
-            if fetch:
-                result = cursor.fetchall()
-                conn.close()
-                return result
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                
+                if fetch:
+                    return cursor.fetchall()
             
-            conn.commit()
-            conn.close()
             return True
         except Exception as e:
             logger.error(f"Database error: {e}")
             return None if fetch else False
+    
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Cursor]:
+        """Run the enclosed statements in one write transaction, rolling back on error"""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+                cursor.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    cursor.execute("ROLLBACK")
+                raise
+    
+    def executemany(self, query: str, seq_of_params, chunk_size: int = 500) -> bool:
+        """Execute a statement for many parameter sets in a single transaction"""
+        try:
+            rows = list(seq_of_params)
+            with self.transaction() as cursor:
+                for start in range(0, len(rows), chunk_size):
+                    cursor.executemany(query, rows[start:start + chunk_size])
+            return True
+        except Exception as e:
+            logger.error(f"Database error: {e}")
+            return False
+    
+    def bulk_insert_jobs(self, jobs: List[Job]) -> bool:
+        """Insert or replace many jobs in a single transaction"""
+        success = self.executemany(
+            SQL_INSERT_JOB,
+            (
+                (job.id, job.title, job.company, job.location, job.description, job.url,
+                 job.salary_range, job.posted_date, job.match_score, job.source)
+                for job in jobs
+            )
+        )
+        if success:
+            # Refresh planner statistics where the insert changed them enough to matter
+            self.execute_query("PRAGMA optimize")
+        return success
+    
+    def get_scraper_cache(self, key: str, max_age: timedelta) -> Optional[str]:
+        """Get a cached scraper payload if it is fresher than max_age"""
+        result = self.execute_query(
+            "SELECT payload FROM scraper_cache WHERE key = ? AND fetched_at >= ?",
+            (key, datetime.now() - max_age),
+            fetch=True
+        )
+        return result[0][0] if result else None
+    
+    def put_scraper_cache(self, key: str, payload: str) -> bool:
+        """Store a scraper payload"""
+        return self.execute_query(
+            "INSERT OR REPLACE INTO scraper_cache (key, payload, fetched_at) VALUES (?, ?, ?)",
+            (key, payload, datetime.now())
+        )
+    
+    def get_stats(self, user_id: str) -> Dict[str, float]:
+        """Get dashboard statistics for a user with a single aggregate query"""
+        result = self.execute_query(
+            """SELECT COUNT(*),
+                      COUNT(*) FILTER (WHERE status = 'pending'),
+                      COUNT(*) FILTER (WHERE response_received = 1),
+                      (SELECT COUNT(*) FROM profiles WHERE user_id = ?)
+               FROM applications
+               WHERE user_id = ?""",
+            (user_id, user_id),
+            fetch=True
+        )
+        total, pending, responses, profiles = result[0] if result else (0, 0, 0, 0)
+        
+        return {
+            'total_applications': total,
+            'pending_applications': pending,
+            'response_rate': (responses / total * 100) if total > 0 else 0,
+            'active_profiles': profiles
+        }
+    
+    def get_application_aggregates(self, user_id: str) -> Dict[str, list]:
+        """Get totals, per-status, per-day and top-company application counts"""
+        try:
+            with self._connection() as conn:
+                totals = conn.execute(
+                    """SELECT COUNT(*), COUNT(*) FILTER (WHERE response_received = 1)
+                       FROM applications WHERE user_id = ?""",
+                    (user_id,)
+                ).fetchone()
+                by_status = conn.execute(
+                    "SELECT status, COUNT(*) FROM applications WHERE user_id = ? GROUP BY status",
+                    (user_id,)
+                ).fetchall()
+                by_day = conn.execute(
+                    """SELECT DATE(applied_date) AS day, COUNT(*) FROM applications
+                       WHERE user_id = ? GROUP BY day ORDER BY day""",
+                    (user_id,)
+                ).fetchall()
+                by_company = conn.execute(
+                    """SELECT j.company, COUNT(*) AS c FROM applications a
+                       JOIN jobs j ON a.job_id = j.id
+                       WHERE a.user_id = ?
+                       GROUP BY j.company ORDER BY c DESC LIMIT 10""",
+                    (user_id,)
+                ).fetchall()
+        except Exception as e:
+            logger.error(f"Aggregate query error: {e}")
+            totals, by_status, by_day, by_company = (0, 0), [], [], []
+        
+        return {
+            'total': totals[0],
+            'responded': totals[1],
+            'by_status': by_status,
+            'by_day': by_day,
+            'by_company': by_company
+        }
 
 class AuthManager:
+    PBKDF2_ITERATIONS = 600_000
+    
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
     
     def hash_password(self, password: str) -> str:
-        """Hash password using SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """Hash password with salted PBKDF2-SHA256"""
+        salt = secrets.token_hex(16)
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), self.PBKDF2_ITERATIONS).hex()
+        return f"pbkdf2_sha256${self.PBKDF2_ITERATIONS}${salt}${digest}"
+    
+    def verify_password(self, password: str, password_hash: str) -> bool:
+        """Check a password against a stored hash (PBKDF2 or legacy unsalted SHA-256)"""
+        if password_hash.startswith("pbkdf2_sha256$"):
+            _, iterations, salt, digest = password_hash.split("$")
+            candidate = hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), int(iterations)).hex()
+        else:
+            digest = password_hash
+            candidate = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(candidate, digest)
     
     def register_user(self, username: str, password: str, email: str = "") -> bool:
         """Register new user"""
@@ -244,20 +539,67 @@ class AuthManager:
     
     def authenticate_user(self, username: str, password: str) -> Optional[str]:
         """Authenticate user and return user ID"""
-        password_hash = self.hash_password(password)
         result = self.db.execute_query(
-            "SELECT id FROM users WHERE username = ? AND password_hash = ?",
-            (username, password_hash),
+            "SELECT id, password_hash FROM users WHERE username = ?",
+            (username,),
             fetch=True
         )
-        return result[0][0] if result else None
+        if not result:
+            return None
+        
+        user_id, password_hash = result[0]
+        if not self.verify_password(password, password_hash):
+            return None
+        
+        # Upgrade legacy SHA-256 hashes on successful login
+        if not password_hash.startswith("pbkdf2_sha256$"):
+            self.db.execute_query(
+                "UPDATE users SET password_hash = ? WHERE id = ?",
+                (self.hash_password(password), user_id)
+            )
+        return user_id
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Process-wide HTTP session with keep-alive connection pooling and retries"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=50,
+        max_retries=Retry(total=3, backoff_factor=0.3)
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    })
+    return session
 
 class JobScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+    CACHE_TTL = timedelta(hours=24)
+    
+    def __init__(self, db_manager: Optional[DatabaseManager] = None):
+        self.session = get_http_session()
+        self.db = db_manager
+    
+    def _cache_key(self, source: str, keywords: str, location: str, limit: int) -> str:
+        """Hash a search for the scraper cache"""
+        search = json.dumps([source, keywords.strip().lower(), location.strip().lower(), limit])
+        return hashlib.blake2b(search.encode(), digest_size=16).hexdigest()
+    
+    def _encode_jobs(self, jobs: List[Job]) -> str:
+        """Serialize jobs for the scraper cache"""
+        return json.dumps([
+            {**{f.name: getattr(job, f.name) for f in fields(Job)}, 'posted_date': job.posted_date.isoformat()}
+            for job in jobs
+        ])
+    
+    def _decode_jobs(self, payload: str) -> List[Job]:
+        """Deserialize jobs from the scraper cache"""
+        return [
+            Job(**{**data, 'posted_date': datetime.fromisoformat(data['posted_date'])})
+            for data in json.loads(payload)
+        ]
     
     def search_indeed_jobs(self, keywords: str, location: str, limit: int = 20) -> List[Job]:
         """Search for jobs on Indeed (simplified version)"""
@@ -312,10 +654,68 @@ class JobScraper:
             logger.error(f"Error scraping LinkedIn: {e}")
             
         return jobs
+    
+    def search_all(self, keywords: str, location: str, sources: List[str], limit: int = 20,
+                   on_progress: Optional[Callable[[int, int], None]] = None) -> List[Job]:
+        """Search the selected job sources concurrently"""
+        searches = {
+            'Indeed': self.search_indeed_jobs,
+            'LinkedIn': self.search_linkedin_jobs,
+        }
+        selected = [source for source in searches if source in sources]
+        results = {}
+        
+        # Serve recent identical searches from the cache; only misses hit the network
+        cache_keys = {source: self._cache_key(source, keywords, location, limit) for source in selected}
+        if self.db:
+            for source in selected:
+                payload = self.db.get_scraper_cache(cache_keys[source], self.CACHE_TTL)
+                if payload is not None:
+                    results[source] = self._decode_jobs(payload)
+        
+        completed = len(results)
+        if on_progress and completed:
+            on_progress(completed, len(selected))
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = {
+                pool.submit(searches[source], keywords, location, limit): source
+                for source in selected if source not in results
+            }
+            for future in as_completed(futures):
+                source = futures[future]
+                results[source] = future.result()
+                if self.db and results[source]:
+                    self.db.put_scraper_cache(cache_keys[source], self._encode_jobs(results[source]))
+                completed += 1
+                if on_progress:
+                    on_progress(completed, len(selected))
+        
+        return [job for source in selected for job in results[source]]
 
 class AIAssistant:
-    def __init__(self, api_key: str):
+    CACHE_TTL = timedelta(days=30)
+    COVER_LETTER_PARAMS = {'model': "gpt-3.5-turbo", 'max_tokens': 500, 'temperature': 0.7}
+    COVER_LETTER_PROMPT = """
+            Write a professional cover letter for the following job application:
+            
+            Job Title: {title}
+            Company: {company}
+            Job Description: {description}...
+            
+            Candidate Profile:
+            Name: Professional Candidate
+            Skills: {skills}
+            Experience: {experience}
+            Summary: {summary}
+            
+            Make it personalized, professional, and highlight relevant skills.
+            Keep it under 300 words.
+            """
+    
+    def __init__(self, api_key: str, db_manager: Optional[DatabaseManager] = None):
         self.api_key = api_key
+        self.db = db_manager
         # Updated OpenAI client initialization for newer versions
         try:
             import openai
@@ -324,106 +724,159 @@ class AIAssistant:
             logger.error(f"Error initializing OpenAI client: {e}")
             self.client = None
     
+    def _cache_key(self, prompt: str, params: Dict) -> str:
+        """Hash a completion request for the response cache"""
+        return hashlib.sha256(json.dumps({'prompt': prompt, **params}, sort_keys=True).encode()).hexdigest()
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Get a cached completion that is still within the TTL"""
+        if not self.db:
+            return None
+        cached = self.db.execute_query(
+            "SELECT response FROM ai_cache WHERE key = ? AND created_at >= datetime('now', ?)",
+            (key, f"-{self.CACHE_TTL.days} days"),
+            fetch=True
+        )
+        return cached[0][0] if cached else None
+    
+    def _cache_put(self, key: str, content: str):
+        """Store a completion in the cache"""
+        if self.db:
+            self.db.execute_query(
+                "INSERT OR REPLACE INTO ai_cache (key, response) VALUES (?, ?)",
+                (key, content)
+            )
+    
+    def _complete(self, prompt: str, parse: Optional[Callable[[str], object]] = None, **params):
+        """Run a chat completion, reusing the stored response for an identical request"""
+        key = self._cache_key(prompt, params)
+        cached = self._cache_get(key)
+        if cached is not None:
+            try:
+                return parse(cached) if parse else cached
+            except Exception as e:
+                logger.error(f"Discarding unusable cached completion: {e}")
+        
+        response = self.client.chat.completions.create(
+            messages=[{"role": "user", "content": prompt}],
+            **params
+        )
+        content = response.choices[0].message.content.strip()
+        # Parse before caching so a malformed reply is never stored and served again
+        result = parse(content) if parse else content
+        self._cache_put(key, content)
+        return result
+    
+    @staticmethod
+    def _parse_answers(content: str) -> List:
+        """Extract the answers list from a Q&A completion"""
+        answers = json.loads(content)["answers"]
+        if not isinstance(answers, list):
+            raise ValueError("answers is not a list")
+        return answers
+    
+    def _cover_letter_prompt(self, job: Job, profile: JobProfile) -> str:
+        """Build the cover letter prompt"""
+        return self.COVER_LETTER_PROMPT.format_map({
+            'title': job.title,
+            'company': job.company,
+            'description': job.description[:500],
+            'skills': profile.skills_text,
+            'experience': profile.experience,
+            'summary': profile.summary
+        })
+    
     def generate_cover_letter(self, job: Job, profile: JobProfile) -> str:
         """Generate AI-powered cover letter"""
         try:
             if not self.client:
                 return self._fallback_cover_letter(job, profile)
-                
-            prompt = f"""
-            Write a professional cover letter for the following job application:
-            
-            Job Title: {job.title}
-            Company: {job.company}
-            Job Description: {job.description[:500]}...
-            
-            Candidate Profile:
-            Name: Professional Candidate
-            Skills: {', '.join(profile.skills)}
-            Experience: {profile.experience}
-            Summary: {profile.summary}
             
-            Make it personalized, professional, and highlight relevant skills.
-            Keep it under 300 words.
-            """
+            return self._complete(self._cover_letter_prompt(job, profile), **self.COVER_LETTER_PARAMS)
             
+        except Exception as e:
+            logger.error(f"Error generating cover letter: {e}")
+            return self._fallback_cover_letter(job, profile)
+    
+    def stream_cover_letter(self, job: Job, profile: JobProfile) -> Iterator[str]:
+        """Generate AI-powered cover letter, yielding text as it arrives"""
+        if not self.client:
+            yield self._fallback_cover_letter(job, profile)
+            return
+        
+        prompt = self._cover_letter_prompt(job, profile)
+        key = self._cache_key(prompt, self.COVER_LETTER_PARAMS)
+        cached = self._cache_get(key)
+        if cached is not None:
+            yield cached
+            return
+        
+        parts = []
+        try:
             response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": prompt}],
-                max_tokens=500,
-                temperature=0.7
+                stream=True,
+                **self.COVER_LETTER_PARAMS
             )
-            
-            return response.choices[0].message.content.strip()
-            
+            for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
         except Exception as e:
             logger.error(f"Error generating cover letter: {e}")
-            return self._fallback_cover_letter(job, profile)
+            if not parts:
+                yield self._fallback_cover_letter(job, profile)
+                return
+            # Part of the letter was already sent; fail rather than let a truncated letter be saved
+            raise
+        
+        self._cache_put(key, "".join(parts).strip())
     
     def generate_qa_answers(self, questions: List[str], job: Job, profile: JobProfile) -> Dict[str, str]:
         """Generate answers for common application questions"""
         answers = {}
         
         try:
-            if not self.client:
+            if not self.client or not questions:
                 return {}
-                
-            for question in questions:
-                prompt = f"""
-                Answer this job application question professionally:
-                Question: {question}
-                
-                Context:
-                Job: {job.title} at {job.company}
-                Your background: {profile.summary}
-                Your skills: {', '.join(profile.skills)}
-                
-                Provide a concise, professional answer (2-3 sentences).
-                """
-                
-                response = self.client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=200,
-                    temperature=0.7
-                )
-                
-                answers[question] = response.choices[0].message.content.strip()
-                
-        except Exception as e:
-            logger.error(f"Error generating Q&A: {e}")
             
-        return answers
-    
-    def calculate_job_match_score(self, job: Job, profile: JobProfile) -> float:
-        """Calculate job match score using AI"""
-        try:
-            if not self.client:
-                return 0.5
-                
+            numbered_questions = "\n".join(f"{i+1}. {question}" for i, question in enumerate(questions))
             prompt = f"""
-            Rate the job match on a scale of 0.0 to 1.0 based on how well the candidate fits the job:
+            Answer these job application questions professionally:
+            {numbered_questions}
             
+            Context:
             Job: {job.title} at {job.company}
-            Job Description: {job.description[:300]}...
-            
-            Candidate:
-            Skills: {', '.join(profile.skills)}
-            Experience: {profile.experience}
-            Target Positions: {', '.join(profile.target_positions)}
+            Your background: {profile.summary}
+            Your skills: {profile.skills_text}
             
-            Return only a decimal number between 0.0 and 1.0.
+            Provide a concise, professional answer (2-3 sentences) for each question.
+            Return a JSON object of the form {{"answers": ["...", "..."]}} with one answer per question, in the same order.
             """
             
-            response = self.client.chat.completions.create(
+            # One request for all questions instead of a round-trip per question
+            generated = self._complete(
+                prompt,
+                parse=self._parse_answers,
                 model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=50,
-                temperature=0.3
+                max_tokens=200 * len(questions),
+                temperature=0.7,
+                response_format={"type": "json_object"}
             )
             
-            score_text = response.choices[0].message.content.strip()
-            return float(re.findall(r'0?\.\d+|[01]', score_text)[0])
+            for question, answer in zip(questions, generated):
+                answers[question] = str(answer).strip()
+        
+        except Exception as e:
+            logger.error(f"Error generating Q&A: {e}")
+            
+        return answers
+    
+    def calculate_job_match_score(self, job: Job, profile: JobProfile) -> float:
+        """Calculate job match score with the same scoring as search results"""
+        try:
+            return float(JobIndex([job]).score(profile)[0])
             
         except Exception as e:
             logger.error(f"Error calculating match score: {e}")
@@ -473,7 +926,9 @@ class FormAutomator:
         
         try:
             self.driver.get(job_url)
-            time.sleep(3)
+            WebDriverWait(self.driver, 10).until(
+                lambda driver: driver.execute_script("return document.readyState") == "complete"
+            )
             
             # This is a simplified version - you'd need to implement
             # specific selectors for each job board
@@ -506,28 +961,19 @@ class FormAutomator:
             return False
     
     def _fill_field_by_selectors(self, selectors: List[str], value: str):
-        """Try multiple selectors to fill a field"""
-        for selector in selectors:
-            try:
-                # Try by name
-                element = self.driver.find_element(By.NAME, selector)
+        """Fill the first visible field matching any of the given names or IDs"""
+        css_selector = ",".join(f"[name='{selector}'],[id='{selector}']" for selector in selectors)
+        for element in self.driver.find_elements(By.CSS_SELECTOR, css_selector):
+            if element.is_displayed():
                 element.clear()
                 element.send_keys(value)
                 return
-            except NoSuchElementException:
-                try:
-                    # Try by ID
-                    element = self.driver.find_element(By.ID, selector)
-                    element.clear()
-                    element.send_keys(value)
-                    return
-                except NoSuchElementException:
-                    continue
     
     def close_driver(self):
         """Close the WebDriver"""
         if self.driver:
             self.driver.quit()
+            self.driver = None
 
 class NotificationManager:
     def __init__(self, email_settings: Dict[str, str]):
@@ -562,18 +1008,129 @@ class NotificationManager:
             logger.error(f"Error sending email: {e}")
             st.warning(f"Email notification failed: {str(e)}")
 
+@st.cache_resource
+def get_db() -> DatabaseManager:
+    """Process-wide database manager, initialised once"""
+    return DatabaseManager()
+
+@st.cache_resource
+def get_scraper() -> JobScraper:
+    """Process-wide job scraper backed by the shared database"""
+    return JobScraper(get_db())
+
+@st.cache_resource
+def get_ai_assistant(api_key: str) -> AIAssistant:
+    """Process-wide AI assistant for an API key"""
+    return AIAssistant(api_key, get_db())
+
+@st.cache_resource
+def ensure_directories():
+    """Create the app's working directories once per process"""
+    Path("resumes").mkdir(parents=True, exist_ok=True)
+
+@st.cache_resource
+def get_io_pool() -> ThreadPoolExecutor:
+    """Process-wide worker pool for blocking file I/O"""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="io")
+
+@st.cache_resource
+def get_ai_pool() -> ThreadPoolExecutor:
+    """Process-wide worker pool for background AI completions, kept apart from file I/O"""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="ai")
+
+def _write_resume(resume_path: str, data: bytes):
+    """Write an uploaded resume to disk"""
+    try:
+        with open(resume_path, "wb") as f:
+            f.write(data)
+    except Exception as e:
+        logger.error(f"Error saving resume {resume_path}: {e}")
+
+# Read caches shared across reruns; the leading underscore keeps the DB handle out of the cache key
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_profiles(_db: DatabaseManager, user_id: str) -> List[Dict]:
+    """Load a user's profiles"""
+    result = _db.execute_query(
+        "SELECT id, name, skills, experience, summary, target_positions FROM profiles WHERE user_id = ?",
+        (user_id,),
+        fetch=True
+    )
+    
+    if result:
+        return [
+            {
+                'id': row[0],
+                'name': row[1],
+                'skills': row[2],
+                'experience': row[3],
+                'summary': row[4],
+                'target_positions': row[5]
+            }
+            for row in result
+        ]
+    return []
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_recent_applications(_db: DatabaseManager, user_id: str, limit: int) -> List[Dict]:
+    """Load a user's most recent applications"""
+    result = _db.execute_query(
+        """SELECT a.applied_date, j.title as job_title, j.company, a.status 
+           FROM applications a 
+           JOIN jobs j ON a.job_id = j.id 
+           WHERE a.user_id = ? 
+           ORDER BY a.applied_date DESC 
+           LIMIT ?""",
+        (user_id, limit),
+        fetch=True
+    )
+    
+    if result:
+        return [
+            {
+                'applied_date': row[0],
+                'job_title': row[1],
+                'company': row[2],
+                'status': row[3]
+            }
+            for row in result
+        ]
+    return []
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_settings(_db: DatabaseManager, user_id: str) -> Dict:
+    """Load a user's settings"""
+    result = _db.execute_query(
+        "SELECT openai_api_key, email_settings, automation_settings, notification_settings FROM settings WHERE user_id = ?",
+        (user_id,),
+        fetch=True
+    )
+    
+    if result:
+        row = result[0]
+        return {
+            'openai_api_key': row[0] or '',
+            'email_settings': json.loads(row[1]) if row[1] else {},
+            'automation_settings': json.loads(row[2]) if row[2] else {},
+            'notification_settings': json.loads(row[3]) if row[3] else {}
+        }
+    return {}
+
 class JobAutomationApp:
     def __init__(self):
-        self.db = DatabaseManager()
+        self.db = get_db()
         self.auth = AuthManager(self.db)
-        self.job_scraper = JobScraper()
-        self.form_automator = FormAutomator()
+        self.job_scraper = get_scraper()
+        ensure_directories()
         
         # Initialize session state
         if 'user_id' not in st.session_state:
             st.session_state.user_id = None
         if 'ai_assistant' not in st.session_state:
             st.session_state.ai_assistant = None
+        if 'form_automator' not in st.session_state:
+            # Kept in session state so the browser is reused across reruns
+            st.session_state.form_automator = FormAutomator()
+        self.form_automator = st.session_state.form_automator
     
     def run(self):
         """Main application runner"""
@@ -755,9 +1312,7 @@ class JobAutomationApp:
                 resume_path = None
                 if resume_file:
                     resume_path = f"resumes/{st.session_state.user_id}_{profile_id}_{resume_file.name}"
-                    os.makedirs("resumes", exist_ok=True)
-                    with open(resume_path, "wb") as f:
-                        f.write(resume_file.getbuffer())
+                    get_io_pool().submit(_write_resume, resume_path, bytes(resume_file.getbuffer()))
                 
                 success = self.db.execute_query(
                     "INSERT OR REPLACE INTO profiles (id, user_id, name, skills, experience, summary, target_positions, resume_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
@@ -765,6 +1320,7 @@ class JobAutomationApp:
                 )
                 
                 if success:
+                    _load_profiles.clear()
                     st.success("Profile saved successfully!")
                     time.sleep(1)
                     st.rerun()
@@ -775,6 +1331,8 @@ class JobAutomationApp:
         """Job search page"""
         st.header("🔍 Job Search")
         
+        profiles = self.get_job_profiles()
+        
         # Search form
         with st.form("job_search_form"):
             col1, col2 = st.columns(2)
@@ -786,92 +1344,114 @@ class JobAutomationApp:
             with col2:
                 job_sources = st.multiselect("Job Sources", ["Indeed", "LinkedIn"], default=["Indeed"])
                 max_results = st.slider("Max Results", 5, 50, 20)
+                match_profile_name = st.selectbox(
+                    "Match Against Profile",
+                    list(profiles)
+                ) if profiles else None
             
             search_submitted = st.form_submit_button("🔍 Search Jobs")
         
         if search_submitted and keywords:
             with st.spinner("Searching for jobs..."):
-                jobs = []
-                
-                if "Indeed" in job_sources:
-                    indeed_jobs = self.job_scraper.search_indeed_jobs(keywords, location, max_results//2)
-                    jobs.extend(indeed_jobs)
+                progress = st.progress(0.0)
+                jobs = self.job_scraper.search_all(
+                    keywords, location, job_sources, max_results//2,
+                    on_progress=lambda completed, total: progress.progress(completed / total)
+                )
                 
-                if "LinkedIn" in job_sources:
-                    linkedin_jobs = self.job_scraper.search_linkedin_jobs(keywords, location, max_results//2)
-                    jobs.extend(linkedin_jobs)
+                results = JobIndex(jobs)
+                if match_profile_name in profiles:
+                    results.score(profiles[match_profile_name])
                 
                 # Save jobs to database
-                for job in jobs:
-                    self.db.execute_query(
-                        "INSERT OR REPLACE INTO jobs (id, title, company, location, description, url, salary_range, posted_date, match_score, source) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                        (job.id, job.title, job.company, job.location, job.description, job.url, job.salary_range, job.posted_date, job.match_score, job.source)
-                    )
+                self.db.bulk_insert_jobs(list(results))
                 
-                st.success(f"Found {len(jobs)} jobs!")
-                st.session_state.search_results = jobs
+                st.success(f"Found {len(results)} jobs!")
+                st.session_state.search_results = results
+                # A fresh table key per search so a selection from the previous results is not carried over
+                st.session_state.search_count = st.session_state.get('search_count', 0) + 1
         
         # Display search results
         if 'search_results' in st.session_state and st.session_state.search_results:
             st.subheader("Search Results")
             
-            for job in st.session_state.search_results:
-                with st.expander(f"📋 {job.title} at {job.company}"):
-                    col1, col2 = st.columns([3, 1])
-                    
-                    with col1:
-                        st.write(f"**Location:** {job.location}")
-                        st.write(f"**Salary:** {job.salary_range}")
-                        st.write(f"**Posted:** {job.posted_date.strftime('%Y-%m-%d')}")
-                        st.write(f"**Description:** {job.description[:200]}...")
-                        st.write(f"**Match Score:** {job.match_score:.2f}/1.0")
-                    
-                    with col2:
-                        profiles = self.get_user_profiles()
-                        if profiles:
-                            selected_profile = st.selectbox(
-                                "Select Profile", 
-                                [p['name'] for p in profiles],
-                                key=f"profile_{job.id}"
-                            )
-                            
-                            if st.button("Apply Now", key=f"apply_{job.id}"):
-                                self.apply_to_job(job, selected_profile, profiles)
-                        else:
-                            st.info("Create a profile first to apply")
+            results = st.session_state.search_results
+            event = st.dataframe(
+                results.to_frame(),
+                use_container_width=True,
+                hide_index=True,
+                on_select="rerun",
+                selection_mode="single-row",
+                key=f"search_results_table_{st.session_state.get('search_count', 0)}"
+            )
+            
+            selected_rows = [i for i in event.selection.rows if i < len(results)]
+            if selected_rows:
+                job = results.row(selected_rows[0])
+                st.subheader(f"📋 {job.title} at {job.company}")
+                apply_clicked = False
+                col1, col2 = st.columns([3, 1])
+                
+                with col1:
+                    st.write(f"**Location:** {job.location}")
+                    st.write(f"**Salary:** {job.salary_range}")
+                    st.write(f"**Posted:** {job.posted_date.strftime('%Y-%m-%d')}")
+                    st.write(f"**Description:** {job.description_preview}")
+                    st.write(f"**Match Score:** {job.match_score:.2f}/1.0")
+                
+                with col2:
+                    if profiles:
+                        selected_profile = st.selectbox(
+                            "Select Profile",
+                            list(profiles),
+                            key=f"profile_{job.id}"
+                        )
+                        
+                        # Warm the cover letter cache while the user reviews the job
+                        if st.session_state.ai_assistant:
+                            prefetched = st.session_state.setdefault('cover_letter_prefetch', {})
+                            if (job.id, selected_profile) not in prefetched:
+                                prefetched[(job.id, selected_profile)] = get_ai_pool().submit(
+                                    st.session_state.ai_assistant.generate_cover_letter,
+                                    job, profiles[selected_profile]
+                                )
                         
-                        if st.button("View Details", key=f"details_{job.id}"):
-                            st.session_state.selected_job = job
+                        apply_clicked = st.button("Apply Now", key=f"apply_{job.id}")
+                    else:
+                        st.info("Create a profile first to apply")
+                
+                # Applied outside the narrow column so the streamed cover letter gets the full width
+                if apply_clicked:
+                    self.apply_to_job(job, selected_profile, profiles)
+            else:
+                st.caption("Select a row to see details and apply.")
     
     def show_applications_page(self):
         """Applications tracking page"""
         st.header("📄 My Applications")
         
-        applications = self.get_user_applications()
+        # Filter options
+        col1, col2, col3 = st.columns(3)
         
-        if applications:
-            # Filter options
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                status_filter = st.selectbox(
-                    "Filter by Status",
-                    ["All", "pending", "applied", "interview", "rejected", "accepted"]
-                )
-            
-            with col2:
-                date_filter = st.date_input("From Date", value=datetime.now() - timedelta(days=30))
-            
-            with col3:
-                company_filter = st.text_input("Company Filter")
-            
-            # Apply filters
-            filtered_apps = applications
-            if status_filter != "All":
-                filtered_apps = [app for app in filtered_apps if app['status'] == status_filter]
-            if company_filter:
-                filtered_apps = [app for app in filtered_apps if company_filter.lower() in app['company'].lower()]
-            
+        with col1:
+            status_filter = st.selectbox(
+                "Filter by Status",
+                ["All", "pending", "applied", "interview", "rejected", "accepted"]
+            )
+        
+        with col2:
+            date_filter = st.date_input("From Date", value=datetime.now() - timedelta(days=30))
+        
+        with col3:
+            company_filter = st.text_input("Company Filter")
+        
+        filtered_apps = self.get_user_applications(
+            status=None if status_filter == "All" else status_filter,
+            company_substr=company_filter or None,
+            from_date=date_filter
+        )
+        
+        if filtered_apps:
             # Display applications
             for app in filtered_apps:
                 with st.expander(f"📋 {app['job_title']} at {app['company']} - {app['status'].title()}"):
@@ -904,7 +1484,7 @@ class JobAutomationApp:
                             st.success("Application updated!")
                             st.rerun()
         else:
-            st.info("No applications found. Start applying to jobs!")
+            st.info("No applications found for these filters. Start applying to jobs!")
     
     def show_analytics_page(self):
         """Analytics and reporting page"""
@@ -913,35 +1493,27 @@ class JobAutomationApp:
         # Get analytics data
         analytics_data = self.get_analytics_data()
         
-        if not analytics_data['applications']:
+        if not analytics_data['total_applications']:
             st.info("No application data available for analytics.")
             return
         
         # Application status distribution
         st.subheader("Application Status Distribution")
-        status_counts = {}
-        for app in analytics_data['applications']:
-            status = app['status']
-            status_counts[status] = status_counts.get(status, 0) + 1
+        status_counts = analytics_data['status_counts']
         
-        if status_counts:
+        if not status_counts.empty:
             fig_pie = px.pie(
-                values=list(status_counts.values()),
-                names=list(status_counts.keys()),
+                status_counts,
+                values='count',
+                names='status',
                 title="Application Status Distribution"
             )
             st.plotly_chart(fig_pie, use_container_width=True)
         
         # Applications over time
         st.subheader("Applications Over Time")
-        df_apps = pd.DataFrame(analytics_data['applications'])
-        df_apps['applied_date'] = pd.to_datetime(df_apps['applied_date'])
-        df_apps['date'] = df_apps['applied_date'].dt.date
-        
-        daily_apps = df_apps.groupby('date').size().reset_index(name='count')
-        
         fig_line = px.line(
-            daily_apps,
+            analytics_data['daily_apps'],
             x='date',
             y='count',
             title="Applications per Day"
@@ -950,12 +1522,13 @@ class JobAutomationApp:
         
         # Top companies applied to
         st.subheader("Top Companies")
-        company_counts = df_apps['company'].value_counts().head(10)
+        company_counts = analytics_data['company_counts']
         
         if not company_counts.empty:
             fig_bar = px.bar(
-                x=company_counts.values,
-                y=company_counts.index,
+                company_counts,
+                x='count',
+                y='company',
                 orientation='h',
                 title="Top 10 Companies Applied To"
             )
@@ -963,9 +1536,9 @@ class JobAutomationApp:
         
         # Response rate analysis
         st.subheader("Response Rate Analysis")
-        responded = len([app for app in analytics_data['applications'] if app['response_received']])
-        total = len(analytics_data['applications'])
-        response_rate = (responded / total * 100) if total > 0 else 0
+        total = analytics_data['total_applications']
+        responded = analytics_data['responded']
+        response_rate = analytics_data['response_rate']
         
         col1, col2, col3 = st.columns(3)
         
@@ -999,7 +1572,7 @@ class JobAutomationApp:
             if st.button("Test AI Connection"):
                 if openai_key:
                     try:
-                        st.session_state.ai_assistant = AIAssistant(openai_key)
+                        st.session_state.ai_assistant = get_ai_assistant(openai_key)
                         st.success("AI connection successful!")
                     except Exception as e:
                         st.error(f"AI connection failed: {e}")
@@ -1071,107 +1644,35 @@ class JobAutomationApp:
     # Helper methods
     def get_user_statistics(self):
         """Get user dashboard statistics"""
-        stats = {}
-        
-        # Total applications
-        result = self.db.execute_query(
-            "SELECT COUNT(*) FROM applications WHERE user_id = ?",
-            (st.session_state.user_id,),
-            fetch=True
-        )
-        stats['total_applications'] = result[0][0] if result else 0
-        
-        # Pending applications
-        result = self.db.execute_query(
-            "SELECT COUNT(*) FROM applications WHERE user_id = ? AND status = 'pending'",
-            (st.session_state.user_id,),
-            fetch=True
-        )
-        stats['pending_applications'] = result[0][0] if result else 0
-        
-        # Response rate
-        result = self.db.execute_query(
-            "SELECT COUNT(*) FROM applications WHERE user_id = ? AND response_received = 1",
-            (st.session_state.user_id,),
-            fetch=True
-        )
-        responses = result[0][0] if result else 0
-        stats['response_rate'] = (responses / stats['total_applications'] * 100) if stats['total_applications'] > 0 else 0
-        
-        # Active profiles
-        result = self.db.execute_query(
-            "SELECT COUNT(*) FROM profiles WHERE user_id = ?",
-            (st.session_state.user_id,),
-            fetch=True
-        )
-        stats['active_profiles'] = result[0][0] if result else 0
-        
-        return stats
+        return self.db.get_stats(st.session_state.user_id)
     
     def get_recent_applications(self, limit=5):
         """Get recent applications"""
-        result = self.db.execute_query(
-            """SELECT a.applied_date, j.title as job_title, j.company, a.status 
-               FROM applications a 
-               JOIN jobs j ON a.job_id = j.id 
-               WHERE a.user_id = ? 
-               ORDER BY a.applied_date DESC 
-               LIMIT ?""",
-            (st.session_state.user_id, limit),
-            fetch=True
-        )
-        
-        if result:
-            return [
-                {
-                    'applied_date': row[0],
-                    'job_title': row[1],
-                    'company': row[2],
-                    'status': row[3]
-                }
-                for row in result
-            ]
-        return []
+        return _load_recent_applications(self.db, st.session_state.user_id, limit)
     
     def get_user_profiles(self):
         """Get user profiles"""
-        result = self.db.execute_query(
-            "SELECT id, name, skills, experience, summary, target_positions FROM profiles WHERE user_id = ?",
-            (st.session_state.user_id,),
-            fetch=True
-        )
-        
-        if result:
-            return [
-                {
-                    'id': row[0],
-                    'name': row[1],
-                    'skills': row[2],
-                    'experience': row[3],
-                    'summary': row[4],
-                    'target_positions': row[5]
-                }
-                for row in result
-            ]
-        return []
+        return _load_profiles(self.db, st.session_state.user_id)
     
     def delete_profile(self, profile_id):
         """Delete a profile"""
-        return self.db.execute_query(
+        success = self.db.execute_query(
             "DELETE FROM profiles WHERE id = ? AND user_id = ?",
             (profile_id, st.session_state.user_id)
         )
+        _load_profiles.clear()
+        return success
     
-    def apply_to_job(self, job, selected_profile_name, profiles):
-        """Apply to a job"""
-        # Find the selected profile
-        profile_data = next((p for p in profiles if p['name'] == selected_profile_name), None)
-        if not profile_data:
-            st.error("Profile not found")
-            return
-        
-        # Create JobProfile object
-        profile = JobProfile(
+    def get_job_profiles(self) -> Dict[str, JobProfile]:
+        """Get user profiles as JobProfile objects keyed by name"""
+        profiles = {}
+        for profile_data in self.get_user_profiles():
+            profiles.setdefault(profile_data['name'], self._build_job_profile(profile_data))
+        return profiles
+    
+    def _build_job_profile(self, profile_data):
+        """Create a JobProfile object from a profile row"""
+        return JobProfile(
             id=profile_data['id'],
             name=profile_data['name'],
             skills=profile_data['skills'].split(',') if profile_data['skills'] else [],
@@ -1180,24 +1681,38 @@ class JobAutomationApp:
             target_positions=profile_data['target_positions'].split(',') if profile_data['target_positions'] else [],
             created_at=datetime.now()
         )
+    
+    def apply_to_job(self, job, selected_profile_name, profiles):
+        """Apply to a job"""
+        profile = profiles.get(selected_profile_name)
+        if not profile:
+            st.error("Profile not found")
+            return
         
         # Generate cover letter using AI if available
         cover_letter = ""
         if st.session_state.ai_assistant:
+            letter_area = st.empty()
             try:
-                cover_letter = st.session_state.ai_assistant.generate_cover_letter(job, profile)
+                # A finished prefetch is served from the cache; one still running is not waited on so streaming starts right away
+                st.session_state.get('cover_letter_prefetch', {}).pop((job.id, selected_profile_name), None)
+                with letter_area:
+                    cover_letter = st.write_stream(st.session_state.ai_assistant.stream_cover_letter(job, profile))
             except Exception as e:
                 logger.error(f"Error generating cover letter: {e}")
+                letter_area.empty()
+                st.warning("The AI cover letter was interrupted, so a standard cover letter was used instead.")
                 cover_letter = f"Dear Hiring Manager,\n\nI am interested in the {job.title} position at {job.company}.\n\nBest regards"
         
         # Create application record
         app_id = str(uuid.uuid4())
         success = self.db.execute_query(
             "INSERT INTO applications (id, job_id, profile_id, user_id, status, applied_date, cover_letter) VALUES (?, ?, ?, ?, ?, ?, ?)",
-            (app_id, job.id, profile_data['id'], st.session_state.user_id, 'applied', datetime.now(), cover_letter)
+            (app_id, job.id, profile.id, st.session_state.user_id, 'applied', datetime.now(), cover_letter)
         )
         
         if success:
+            _load_recent_applications.clear()
             st.success(f"Successfully applied to {job.title} at {job.company}!")
             
             # Send notification if enabled
@@ -1215,17 +1730,30 @@ class JobAutomationApp:
         else:
             st.error("Failed to submit application")
     
-    def get_user_applications(self):
-        """Get user applications with job details"""
+    def get_user_applications(self, status=None, company_substr=None, from_date=None):
+        """Get user applications with job details, optionally filtered in SQL"""
+        clauses = ["a.user_id = ?"]
+        params = [st.session_state.user_id]
+        if status:
+            clauses.append("a.status = ?")
+            params.append(status)
+        if company_substr:
+            escaped = company_substr.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            clauses.append("j.company LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        if from_date:
+            clauses.append("a.applied_date >= ?")
+            params.append(from_date.isoformat())
+        
         result = self.db.execute_query(
-            """SELECT a.id, a.status, a.applied_date, a.cover_letter, a.notes, a.response_received,
+            f"""SELECT a.id, a.status, a.applied_date, a.cover_letter, a.notes, a.response_received,
                       j.title as job_title, j.company, p.name as profile_name
                FROM applications a
                JOIN jobs j ON a.job_id = j.id
                JOIN profiles p ON a.profile_id = p.id
-               WHERE a.user_id = ?
+               WHERE {' AND '.join(clauses)}
                ORDER BY a.applied_date DESC""",
-            (st.session_state.user_id,),
+            tuple(params),
             fetch=True
         )
         
@@ -1248,54 +1776,56 @@ class JobAutomationApp:
     
     def update_application_status(self, app_id, status, notes):
         """Update application status and notes"""
-        return self.db.execute_query(
+        success = self.db.execute_query(
             "UPDATE applications SET status = ?, notes = ? WHERE id = ? AND user_id = ?",
             (status, notes, app_id, st.session_state.user_id)
         )
+        _load_recent_applications.clear()
+        return success
     
     def get_analytics_data(self):
-        """Get analytics data"""
-        applications = self.get_user_applications()
+        """Get analytics data as ready-to-plot frames"""
+        aggregates = self.db.get_application_aggregates(st.session_state.user_id)
+        total = aggregates['total']
         
         return {
-            'applications': applications,
-            'total_applications': len(applications),
-            'response_rate': len([app for app in applications if app['response_received']]) / len(applications) * 100 if applications else 0
+            'total_applications': total,
+            'responded': aggregates['responded'],
+            'response_rate': aggregates['responded'] / total * 100 if total else 0,
+            'status_counts': pd.DataFrame(aggregates['by_status'], columns=['status', 'count']),
+            'daily_apps': pd.DataFrame(aggregates['by_day'], columns=['date', 'count']),
+            'company_counts': pd.DataFrame(aggregates['by_company'], columns=['company', 'count'])
         }
     
     def get_user_settings(self):
         """Get user settings"""
-        result = self.db.execute_query(
-            "SELECT openai_api_key, email_settings, automation_settings, notification_settings FROM settings WHERE user_id = ?",
-            (st.session_state.user_id,),
-            fetch=True
-        )
-        
-        if result:
-            row = result[0]
-            return {
-                'openai_api_key': row[0] or '',
-                'email_settings': json.loads(row[1]) if row[1] else {},
-                'automation_settings': json.loads(row[2]) if row[2] else {},
-                'notification_settings': json.loads(row[3]) if row[3] else {}
-            }
-        return {}
+        return _load_settings(self.db, st.session_state.user_id)
     
     def save_user_settings(self, settings):
-        """Save user settings"""
-        current_settings = self.get_user_settings()
-        current_settings.update(settings)
+        """Save user settings, writing only the keys that are given"""
+        def column(key):
+            if key not in settings:
+                return None
+            return settings[key] if key == 'openai_api_key' else json.dumps(settings[key])
         
-        return self.db.execute_query(
-            "INSERT OR REPLACE INTO settings (user_id, openai_api_key, email_settings, automation_settings, notification_settings) VALUES (?, ?, ?, ?, ?)",
+        success = self.db.execute_query(
+            """INSERT INTO settings (user_id, openai_api_key, email_settings, automation_settings, notification_settings)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT (user_id) DO UPDATE SET
+                   openai_api_key = COALESCE(excluded.openai_api_key, settings.openai_api_key),
+                   email_settings = COALESCE(excluded.email_settings, settings.email_settings),
+                   automation_settings = COALESCE(excluded.automation_settings, settings.automation_settings),
+                   notification_settings = COALESCE(excluded.notification_settings, settings.notification_settings)""",
             (
                 st.session_state.user_id,
-                current_settings.get('openai_api_key', ''),
-                json.dumps(current_settings.get('email_settings', {})),
-                json.dumps(current_settings.get('automation_settings', {})),
-                json.dumps(current_settings.get('notification_settings', {}))
+                column('openai_api_key'),
+                column('email_settings'),
+                column('automation_settings'),
+                column('notification_settings')
             )
         )
+        _load_settings.clear()
+        return success
     
     def get_user_email(self):
         """Get user email"""
@@ -1321,11 +1851,10 @@ class JobAutomationApp:
                 'exported_at': datetime.now().isoformat()
             }
             
-            # Create download
-            json_data = json.dumps(export_data, indent=2, default=str)
+            # Compact one-shot encode uses the C encoder and skips the indentation whitespace
             st.download_button(
                 label="📥 Download Data Export",
-                data=json_data,
+                data=json.dumps(export_data, default=str, separators=(',', ':')).encode('utf-8'),
                 file_name=f"job_automation_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                 mime="application/json"
             )
@@ -1336,11 +1865,16 @@ class JobAutomationApp:
     def delete_user_account(self):
         """Delete user account and all associated data"""
         try:
-            # Delete all user data
-            self.db.execute_query("DELETE FROM applications WHERE user_id = ?", (st.session_state.user_id,))
-            self.db.execute_query("DELETE FROM profiles WHERE user_id = ?", (st.session_state.user_id,))
-            self.db.execute_query("DELETE FROM settings WHERE user_id = ?", (st.session_state.user_id,))
-            self.db.execute_query("DELETE FROM users WHERE id = ?", (st.session_state.user_id,))
+            # Delete all user data in one transaction
+            user_id = st.session_state.user_id
+            with self.db.transaction() as tx:
+                tx.execute("DELETE FROM applications WHERE user_id = ?", (user_id,))
+                tx.execute("DELETE FROM profiles WHERE user_id = ?", (user_id,))
+                tx.execute("DELETE FROM settings WHERE user_id = ?", (user_id,))
+                tx.execute("DELETE FROM users WHERE id = ?", (user_id,))
+            _load_profiles.clear()
+            _load_recent_applications.clear()
+            _load_settings.clear()
             
             # Clear session
             for key in list(st.session_state.keys()):
@@ -1349,28 +1883,28 @@ class JobAutomationApp:
         except Exception as e:
             st.error(f"Account deletion failed: {e}")
 
-def run_automation_scheduler():
-    """Background scheduler for automation tasks"""
-    def check_and_apply():
-        """Check for new jobs and auto-apply if conditions are met"""
-        try:
-            # This would run the automation logic
-            # For now, it's a placeholder
-            logger.info("Running automation check...")
-        except Exception as e:
-            logger.error(f"Automation error: {e}")
-    
-    # Schedule automation to run every hour
-    schedule.every().hour.do(check_and_apply)
-    
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
+def check_and_apply():
+    """Check for new jobs and auto-apply if conditions are met"""
+    try:
+        # This would run the automation logic
+        # For now, it's a placeholder
+        logger.info("Running automation check...")
+    except Exception as e:
+        logger.error(f"Automation error: {e}")
+
+@st.cache_resource
+def start_automation_scheduler() -> BackgroundScheduler:
+    """Start the background automation scheduler once per process"""
+    scheduler = BackgroundScheduler(daemon=True)
+    # Run automation every hour
+    scheduler.add_job(check_and_apply, 'interval', hours=1, id='check_and_apply', coalesce=True, max_instances=1)
+    scheduler.start()
+    atexit.register(scheduler.shutdown, wait=False)
+    return scheduler
 
 if __name__ == "__main__":
-    # Start the automation scheduler in a background thread
-    automation_thread = threading.Thread(target=run_automation_scheduler, daemon=True)
-    automation_thread.start()
+    # Start the automation scheduler
+    start_automation_scheduler()
     
     # Run the Streamlit app
     app = JobAutomationApp()